@@ -0,0 +1,54 @@
+"""
+Response compression middleware for AI-DIY application.
+
+Wraps Starlette's GZipMiddleware so large JSON and HTML responses are
+compressed, while Server-Sent Events streams pass through untouched
+(gzip would buffer each event until enough output accumulates).
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Responses smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+
+STREAMING_MEDIA_TYPES = ("text/event-stream",)
+
+
+class _StreamAwareGZipResponder(GZipResponder):
+    """GZip responder that leaves event streams uncompressed."""
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(STREAMING_MEDIA_TYPES):
+                # Reuse the pass-through path taken for pre-encoded responses
+                self.initial_message = message
+                self.content_encoding_set = True
+                return
+        await super().send_with_gzip(message)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZip responses for clients that accept it, skipping SSE streams."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = GZIP_MINIMUM_SIZE,
+        compresslevel: int = GZIP_COMPRESS_LEVEL,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = _StreamAwareGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -62,6 +62,10 @@ class StructuredLogger:
         """Clear all context fields.""" 
         self.context.clear()
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Check the level before building an expensive message."""
+        return self.logger.isEnabledFor(level)
+    
     def _log_with_context(self, level: int, message: str, **kwargs):
         """Log message with context and additional fields."""
         # Reserve standard logging kwargs so they are not placed in `extra`
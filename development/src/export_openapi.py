@@ -10,11 +10,14 @@ from pathlib import Path
 # Add src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from main import app
+from main import app, load_routers
 
 def export_openapi_spec():
     """Export the FastAPI OpenAPI specification to a JSON file."""
     
+    # Routers are normally registered at startup; register them explicitly here
+    load_routers(app)
+
     # Get the OpenAPI schema
     openapi_schema = app.openapi()
     
@@ -15,16 +15,27 @@ import os
 import sys
 import signal
 import logging
+import importlib
+import importlib.util
+import functools
+import hashlib
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import requests
 import secrets
-import base64
+
+from compression_middleware import CompressionMiddleware
+
+# Prefer orjson for JSON responses when it is installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 # Track which enhanced features are available
 FEATURES = {
@@ -34,9 +45,45 @@ FEATURES = {
     "data_manager": False
 }
 
+# Optional enhanced-feature modules: feature -> [(module, names bound into this module)]
+OPTIONAL_FEATURES = {
+    "config_manager": [
+        ("config_manager", ["validate_startup_configuration", "config_manager"]),
+    ],
+    "logging_middleware": [
+        ("logging_middleware", ["setup_structured_logging", "logging_middleware"]),
+    ],
+    "security_middleware": [
+        ("security_middleware", ["SecurityMiddleware", "InputValidationMiddleware",
+                                 "SecurityConfig", "security_audit", "rate_limiter"]),
+        ("security_utils", ["SecurityUtils", "FileSecurityValidator", "security_logger"]),
+    ],
+    "data_manager": [
+        ("data_manager", ["data_manager"]),
+    ],
+}
+
+def _import_optional(feature: str):
+    """Bind an optional feature's names into module globals.
+
+    Raises ImportError if any of its modules is missing or fails to import.
+    find_spec() rejects absent modules without running the import machinery.
+    """
+    imported = {}
+    for module_name, names in OPTIONAL_FEATURES[feature]:
+        if importlib.util.find_spec(module_name) is None:
+            raise ImportError(f"No module named '{module_name}'")
+        module = importlib.import_module(module_name)
+        for name in names:
+            try:
+                imported[name] = getattr(module, name)
+            except AttributeError as e:
+                raise ImportError(f"cannot import name '{name}' from '{module_name}'") from e
+    globals().update(imported)
+
 # Try to import and validate configuration (Phase 2: Fail-Fast)
 try:
-    from config_manager import validate_startup_configuration, config_manager
+    _import_optional("config_manager")
     validate_startup_configuration()
     app_config = config_manager.get_app_config()
     models_config = config_manager.get_models_config()
@@ -77,7 +124,7 @@ logger = logging.getLogger(__name__)
 
 # Try to import structured logging middleware (Phase 4)
 try:
-    from logging_middleware import setup_structured_logging, logging_middleware
+    _import_optional("logging_middleware")
     setup_structured_logging(app_config)
     FEATURES["logging_middleware"] = True
     logger.info("✅ Structured logging middleware loaded")
@@ -87,11 +134,7 @@ except ImportError:
 
 # Try to import security middleware (Phase 5)
 try:
-    from security_middleware import (
-        SecurityMiddleware, InputValidationMiddleware,
-        SecurityConfig, security_audit, rate_limiter
-    )
-    from security_utils import SecurityUtils, FileSecurityValidator, security_logger
+    _import_optional("security_middleware")
     FEATURES["security_middleware"] = True
     logger.info("✅ Security middleware loaded")
 except ImportError:
@@ -101,7 +144,7 @@ except ImportError:
 
 # Try to import data manager (Phase 3)
 try:
-    from data_manager import data_manager
+    _import_optional("data_manager")
     FEATURES["data_manager"] = True
     logger.info("✅ Data manager loaded")
 except ImportError:
@@ -112,11 +155,24 @@ except ImportError:
 from core.logging_config import get_structured_logger
 structured_logger = get_structured_logger("main")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Register API routers and clean up orphaned apps before serving requests."""
+    load_routers(app)
+    _kill_orphaned_app()
+    yield
+    # Close the pooled OpenRouter session if any request opened it
+    ai_gateway = sys.modules.get("services.ai_gateway")
+    if ai_gateway is not None:
+        await ai_gateway.close_http_session()
+
 # Create FastAPI application
 app = FastAPI(
     title="AI-DIY: Scrum Sim V3",
     description="AI-First Virtual Scrum Team with Enhanced Features",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # Auth0 Configuration
@@ -184,6 +240,9 @@ async def callback(request: Request):
         "redirect_uri": CALLBACK_URL
     }
     
+    # Only the Auth0 callback needs requests; import it on first use
+    import requests
+
     try:
         token_response = requests.post(token_url, json=token_payload)
         token_response.raise_for_status()
@@ -228,12 +287,16 @@ async def logout():
     )
     return RedirectResponse(logout_url)
 
+# Paths checked by the per-request middlewares, built once at import
+PUBLIC_PATHS = frozenset(["/login", "/callback", "/logout", "/test", "/health", "/health/deep"])
+WIREFRAME_PREFIX = "/api/backlog/wireframe/"
+
 # Auth0 validation middleware for main app
 @app.middleware("http")
 async def auth0_middleware(request: Request, call_next):
     # Skip Auth0 validation for Auth0 routes and public endpoints only
-    public_paths = ["/login", "/callback", "/logout", "/test", "/health"]
-    if request.url.path in public_paths or request.url.path.startswith("/api/backlog/wireframe/"):
+    path = request.scope["path"]
+    if path in PUBLIC_PATHS or path.startswith(WIREFRAME_PREFIX):
         return await call_next(request)
     
     # For all other routes, check for Auth0 session
@@ -256,6 +319,10 @@ if not app_config.is_production:
     )
     logger.info("Development CORS enabled")
 
+# Compress large responses; added before the security middleware so it sits
+# inside it and security headers are applied to the compressed response
+app.add_middleware(CompressionMiddleware)
+
 # Add security middleware if available (Phase 5)
 if FEATURES["security_middleware"]:
     app.add_middleware(SecurityMiddleware)
@@ -267,46 +334,123 @@ if FEATURES["logging_middleware"] and logging_middleware:
     app.middleware("http")(logging_middleware)
     logger.info("📊 Structured logging middleware active")
 
-# Import and include routers
-from streaming import router as streaming_router
-from api.models import router as models_router
-from api.change_requests import router as change_requests_router
-from api.testing import router as testing_router
-from api.chat import router as chat_router
-from api.vision import router as vision_router
-from api.backlog import router as backlog_router
-from api.scribe import router as scribe_router
-from api.sprint import router as sprint_router
-from api.sandbox import router as sandbox_router
-from api.session import router as session_router
-from api.download import router as download_router
-
-app.include_router(streaming_router)
-app.include_router(models_router)
-app.include_router(change_requests_router)
-app.include_router(testing_router)
-app.include_router(chat_router)
-app.include_router(vision_router)
-app.include_router(backlog_router)
-app.include_router(scribe_router)
-app.include_router(sprint_router)
-app.include_router(sandbox_router)
-app.include_router(session_router)
-app.include_router(download_router, prefix="/api/download", tags=["download"])
-
-logger.info("✅ All API routers loaded successfully")
+# API routers, registered lazily from the lifespan handler so importing main
+# does not pull in every router's transitive imports up front.
+# Each entry is (module path, include_router kwargs).
+ROUTER_MODULES = [
+    ("streaming", {}),
+    ("api.models", {}),
+    ("api.change_requests", {}),
+    ("api.testing", {}),
+    ("api.chat", {}),
+    ("api.vision", {}),
+    ("api.backlog", {}),
+    ("api.scribe", {}),
+    ("api.sprint", {}),
+    ("api.sandbox", {}),
+    ("api.session", {}),
+    ("api.download", {"prefix": "/api/download", "tags": ["download"]}),
+]
+_routers_loaded = False
+
+def load_routers(target_app: FastAPI):
+    """Import and include all API routers (idempotent)."""
+    global _routers_loaded
+    if _routers_loaded:
+        return
+    for module_name, include_kwargs in ROUTER_MODULES:
+        module = importlib.import_module(module_name)
+        target_app.include_router(module.router, **include_kwargs)
+    _routers_loaded = True
+    logger.info("✅ All API routers loaded successfully")
 
 # App control endpoint
 from pydantic import BaseModel as PydanticBaseModel
-import subprocess
 import asyncio
+import collections
 import signal
+import socket
 # Module-level variable to track the running generated app process
 _generated_app_process = None
+# Most recent output lines from the generated app, drained continuously so a
+# chatty child can never block on a full pipe
+APP_OUTPUT_MAX_LINES = 200
+_generated_app_output = {
+    "stdout": collections.deque(maxlen=APP_OUTPUT_MAX_LINES),
+    "stderr": collections.deque(maxlen=APP_OUTPUT_MAX_LINES),
+}
+_generated_app_drainers = []
+# PID of the generated app's process group, persisted so a restarted server
+# can clean up an app started by its previous instance
+GENERATED_APP_PID_FILE = Path("/tmp/ai-diy-child.pid")
+# Guards _generated_app_process against concurrent /api/control-app requests
+_control_app_lock = asyncio.Lock()
+# Use consistent path resolution (matches sprint_orchestrator.py pattern)
+SANDBOX_BASE = Path("static/appdocs/execution-sandbox/client-projects")
 
 class AppControlRequest(PydanticBaseModel):
     action: str  # "start" or "stop"
 
+@functools.lru_cache(maxsize=4)
+def _resolve_project(project_name: str) -> Path:
+    """Resolve the sandbox directory for a generated project (cached)."""
+    return SANDBOX_BASE / project_name
+
+def _kill_orphaned_app():
+    """Kill the process group recorded in the PID file, if any, and remove the file."""
+    try:
+        pid = int(GENERATED_APP_PID_FILE.read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return
+    try:
+        # npm start runs under os.setsid, so its process group id is its PID
+        os.killpg(pid, signal.SIGKILL)
+        logger.info(f"Killed orphaned app process group {pid}")
+    except ProcessLookupError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error killing orphaned process group {pid}: {e}")
+    GENERATED_APP_PID_FILE.unlink(missing_ok=True)
+
+async def _wait_port_free(port: int, timeout: float = 5.0) -> bool:
+    """Poll until the port can be bound, without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            probe.bind(("0.0.0.0", port))
+            return True
+        except OSError:
+            await asyncio.sleep(0.1)
+        finally:
+            probe.close()
+    return False
+
+async def _wait_for_early_exit(process, timeout: float = 2.0):
+    """Wait on a freshly started process; return its exit code if it dies within timeout."""
+    try:
+        return await asyncio.wait_for(asyncio.shield(process.wait()), timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+
+async def _drain_stream(stream, lines):
+    """Read a child pipe until EOF, keeping only the most recent lines."""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        lines.append(line.decode(errors="replace").rstrip("\n"))
+
+def _scan_project_dir(project_dir: Path):
+    """List a project directory's entry names in one pass, or None if it is missing."""
+    try:
+        with os.scandir(project_dir) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
 @app.post("/api/control-app")
 async def control_app(request: AppControlRequest):
     """Start or stop the generated application.
@@ -316,184 +460,213 @@ async def control_app(request: AppControlRequest):
     """
     global _generated_app_process
 
-    try:
-        # Fixed project folder - single pipeline
-        project_name = "yourapp"
-
-        # Use consistent path resolution (matches sprint_orchestrator.py pattern)
-        sandbox_base = Path("static/appdocs/execution-sandbox/client-projects")
-        project_dir = sandbox_base / project_name
-
-        if not project_dir.exists():
-            raise HTTPException(status_code=404, detail="No app found. Complete a sprint first.")
-
-        # Check for package.json to verify it's a valid Node project
-        if not (project_dir / "package.json").exists():
-            raise HTTPException(status_code=400, detail="No package.json found. Sprint may not have completed.")
-
-        if request.action == "start":
-            # Ruthlessly kill ANY process on port 3000 first (manual, orphaned, or managed)
-            logger.info("Ruthlessly clearing port 3000 before starting app")
+    # Serialize start/stop/status so concurrent requests cannot race on the process handle
+    async with _control_app_lock:
+        try:
+            # Fixed project folder - single pipeline
+            project_name = "yourapp"
+            project_dir = _resolve_project(project_name)
+
+            # Single directory scan covers the existence, package.json and node_modules checks
+            project_entries = _scan_project_dir(project_dir)
+            if project_entries is None:
+                raise HTTPException(status_code=404, detail="No app found. Complete a sprint first.")
+
+            # Check for package.json to verify it's a valid Node project
+            if "package.json" not in project_entries:
+                raise HTTPException(status_code=400, detail="No package.json found. Sprint may not have completed.")
+
+            if request.action == "start":
+                # Kill any app we started earlier (managed or orphaned) before starting again
+                logger.info("Clearing port 3000 before starting app")
             
-            # Kill Python-managed process and its entire process group if it exists
-            if _generated_app_process is not None:
-                if _generated_app_process.poll() is None:  # Still running
-                    pid = _generated_app_process.pid
-                    logger.info(f"Force killing process group for PID {pid}")
-                    try:
-                        # Kill the entire process group (parent and all children)
-                        os.killpg(os.getpgid(pid), signal.SIGKILL)
-                    except Exception as e:
-                        logger.warning(f"Error killing process group: {e}, trying direct kill")
-                        _generated_app_process.kill()
-                    _generated_app_process.wait()
-                _generated_app_process = None
-            
-            # Kill ALL node processes (including child processes)
-            try:
-                logger.info("Killing all node processes")
-                subprocess.run(["pkill", "-9", "node"], timeout=5)
-            except Exception as e:
-                logger.warning(f"Error killing node processes: {e}")
+                # Kill Python-managed process and its entire process group if it exists
+                if _generated_app_process is not None:
+                    if _generated_app_process.returncode is None:  # Still running
+                        pid = _generated_app_process.pid
+                        logger.info(f"Force killing process group for PID {pid}")
+                        try:
+                            # Kill the entire process group (parent and all children)
+                            os.killpg(os.getpgid(pid), signal.SIGKILL)
+                        except Exception as e:
+                            logger.warning(f"Error killing process group: {e}, trying direct kill")
+                            _generated_app_process.kill()
+                        await _generated_app_process.wait()
+                    _generated_app_process = None
             
-            # Wait for OS to fully release port 3000
-            import time
-            time.sleep(5)
+                # Kill an app left running by a previous server instance
+                _kill_orphaned_app()
             
-            logger.info("Port 3000 cleared, ready to start app")
-
-            # Install npm dependencies if node_modules doesn't exist
-            node_modules_dir = project_dir / "node_modules"
-            if not node_modules_dir.exists():
-                logger.info(f"Installing npm dependencies using shell script for {project_name}...")
+                # Wait (without blocking the event loop) for the OS to release port 3000
+                if await _wait_port_free(3000, timeout=5.0):
+                    logger.info("Port 3000 cleared, ready to start app")
+                else:
+                    logger.warning("Port 3000 still in use after 5s, starting app anyway")
+
+                # Install npm dependencies if node_modules doesn't exist
+                if "node_modules" not in project_entries:
+                    logger.info(f"Installing npm dependencies using shell script for {project_name}...")
                 
-                # Get script path (relative to main.py)
-                script_path = Path(__file__).parent / "scripts" / "install-deps.sh"
+                    # Get script path (relative to main.py)
+                    script_path = Path(__file__).parent / "scripts" / "install-deps.sh"
                 
-                if not script_path.exists():
-                    raise HTTPException(status_code=500, detail=f"Install script not found: {script_path}")
+                    if not script_path.exists():
+                        raise HTTPException(status_code=500, detail=f"Install script not found: {script_path}")
                 
-                # Run the shell script
-                result = os.system(f"bash {script_path}")
+                    # Run the shell script without blocking the event loop
+                    install = await asyncio.create_subprocess_exec(
+                        "bash", str(script_path),
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    install_stdout, install_stderr = await install.communicate()
+                    result = install.returncode
                 
-                if result != 0:
-                    raise HTTPException(status_code=500, detail=f"npm install script failed with exit code {result}")
+                    if result != 0:
+                        logger.error(f"npm install STDOUT: {install_stdout.decode(errors='replace')}")
+                        logger.error(f"npm install STDERR: {install_stderr.decode(errors='replace')}")
+                        raise HTTPException(status_code=500, detail=f"npm install script failed with exit code {result}")
                 
-                logger.info("Dependencies installed successfully via shell script")
+                    logger.info("Dependencies installed successfully via shell script")
 
-            # Run npm start in project directory
-            # Capture output to log any startup errors
-            env = {**os.environ, "PORT": "3000"}
-            
-            # Start the process with output capture in a new process group
-            _generated_app_process = subprocess.Popen(
-                ["npm", "start"],
-                cwd=str(project_dir),
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                preexec_fn=os.setsid  # Start in new process group
-            )
+                # Run npm start in project directory
+                # Capture output to log any startup errors
+                env = {**os.environ, "PORT": "3000"}
             
-            # Wait briefly to check for immediate failures
-            import time
-            time.sleep(2)
-            
-            # Check if process is still running
-            if _generated_app_process.poll() is not None:
-                # Process already exited - capture output
-                stdout, stderr = _generated_app_process.communicate()
-                exit_code = _generated_app_process.returncode
-                logger.error(f"App failed to start. Exit code: {exit_code}")
-                logger.error(f"STDOUT: {stdout}")
-                logger.error(f"STDERR: {stderr}")
-                _generated_app_process = None
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"App failed to start. Exit code: {exit_code}. Check logs for details."
+                # Start the process with output capture in a new process group
+                _generated_app_process = await asyncio.create_subprocess_exec(
+                    "npm", "start",
+                    cwd=str(project_dir),
+                    env=env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    preexec_fn=os.setsid  # Start in new process group
                 )
-
-            logger.info(f"Started {project_name} app with PID {_generated_app_process.pid} on port 3000")
-            return {
-                "success": True,
-                "message": f"Started {project_name}",
-                "pid": _generated_app_process.pid,
-                "project_name": project_name,
-                "url": "/yourapp/"
-            }
-
-        elif request.action == "stop":
-            # Kill the entire process group to ensure all child processes are terminated
-            logger.info("Stopping app - killing process group")
+                for stream_name in ("stdout", "stderr"):
+                    _generated_app_output[stream_name].clear()
+                _generated_app_drainers[:] = [
+                    asyncio.create_task(_drain_stream(_generated_app_process.stdout, _generated_app_output["stdout"])),
+                    asyncio.create_task(_drain_stream(_generated_app_process.stderr, _generated_app_output["stderr"])),
+                ]
+                GENERATED_APP_PID_FILE.write_text(str(_generated_app_process.pid))
             
-            # Kill Python-managed process and its entire process group if it exists
-            if _generated_app_process is not None and _generated_app_process.poll() is None:
-                pid = _generated_app_process.pid
-                logger.info(f"Stopping process group for PID {pid}")
-                try:
-                    # Kill the entire process group (parent and all children)
-                    os.killpg(os.getpgid(pid), signal.SIGKILL)
-                    logger.info(f"Killed process group for PID {pid}")
-                except Exception as e:
-                    logger.warning(f"Error killing process group: {e}, trying direct kill")
-                    _generated_app_process.kill()
-                _generated_app_process.wait()
-                logger.info(f"Stopped Python-managed process (PID {pid})")
-
-            _generated_app_process = None
-            logger.info(f"Stopped all processes on port 3000")
-            return {"success": True, "message": f"Stopped {project_name} and cleared port 3000"}
-
-        elif request.action == "status":
-            if _generated_app_process is None:
-                return {"success": True, "running": False, "message": "No app started"}
-            elif _generated_app_process.poll() is None:
+                # Watch briefly for immediate failures
+                if await _wait_for_early_exit(_generated_app_process, timeout=2.0) is not None:
+                    # Process already exited - let the drainers reach EOF, then log output
+                    await asyncio.gather(*_generated_app_drainers, return_exceptions=True)
+                    exit_code = _generated_app_process.returncode
+                    logger.error(f"App failed to start. Exit code: {exit_code}")
+                    logger.error("STDOUT: " + "\n".join(_generated_app_output["stdout"]))
+                    logger.error("STDERR: " + "\n".join(_generated_app_output["stderr"]))
+                    _generated_app_process = None
+                    GENERATED_APP_PID_FILE.unlink(missing_ok=True)
+                    raise HTTPException(
+                        status_code=500, 
+                        detail=f"App failed to start. Exit code: {exit_code}. Check logs for details."
+                    )
+
+                logger.info(f"Started {project_name} app with PID {_generated_app_process.pid} on port 3000")
                 return {
                     "success": True,
-                    "running": True,
+                    "message": f"Started {project_name}",
                     "pid": _generated_app_process.pid,
                     "project_name": project_name,
                     "url": "/yourapp/"
                 }
-            else:
-                return {"success": True, "running": False, "message": "App has exited", "exit_code": _generated_app_process.returncode}
 
-        else:
-            raise HTTPException(status_code=400, detail="Invalid action. Use 'start', 'stop', or 'status'")
+            elif request.action == "stop":
+                # Kill the entire process group to ensure all child processes are terminated
+                logger.info("Stopping app - killing process group")
+            
+                # Kill Python-managed process and its entire process group if it exists
+                if _generated_app_process is not None and _generated_app_process.returncode is None:
+                    pid = _generated_app_process.pid
+                    logger.info(f"Stopping process group for PID {pid}")
+                    try:
+                        # Kill the entire process group (parent and all children)
+                        os.killpg(os.getpgid(pid), signal.SIGKILL)
+                        logger.info(f"Killed process group for PID {pid}")
+                    except Exception as e:
+                        logger.warning(f"Error killing process group: {e}, trying direct kill")
+                        _generated_app_process.kill()
+                    await _generated_app_process.wait()
+                    logger.info(f"Stopped Python-managed process (PID {pid})")
+
+                _generated_app_process = None
+                GENERATED_APP_PID_FILE.unlink(missing_ok=True)
+                _resolve_project.cache_clear()
+                logger.info(f"Stopped all processes on port 3000")
+                return {"success": True, "message": f"Stopped {project_name} and cleared port 3000"}
+
+            elif request.action == "status":
+                if _generated_app_process is None:
+                    return {"success": True, "running": False, "message": "No app started"}
+                elif _generated_app_process.returncode is None:
+                    return {
+                        "success": True,
+                        "running": True,
+                        "pid": _generated_app_process.pid,
+                        "project_name": project_name,
+                        "url": "/yourapp/"
+                    }
+                else:
+                    return {"success": True, "running": False, "message": "App has exited", "exit_code": _generated_app_process.returncode}
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error controlling app: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            else:
+                raise HTTPException(status_code=400, detail="Invalid action. Use 'start', 'stop', or 'status'")
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error controlling app: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
 
 # Note: Generated app reverse proxy is now handled by Caddy
 # Generated apps are accessible at /yourapp/ via Caddy configuration
 
-# Ensure required directory structure exists
+def _ensure_tree(root: Path, leaves):
+    """Create any missing leaf directories under root (parents created as needed)."""
+    for parts in leaves:
+        try:
+            root.joinpath(*parts).mkdir(parents=True)
+        except FileExistsError:
+            pass
+
+# Ensure required directory structure exists, including appdocs subdirectories
 static_dir = Path(__file__).parent / "static"
-static_dir.mkdir(parents=True, exist_ok=True)
-
-# Create required appdocs subdirectories
-appdocs_dirs = [
-    static_dir / "appdocs" / "visions",
-    static_dir / "appdocs" / "backlog" / "wireframes",
-    static_dir / "appdocs" / "sprints" / "backups",
-    static_dir / "appdocs" / "scribe",
-    static_dir / "appdocs" / "sessions",
-]
-for dir_path in appdocs_dirs:
-    dir_path.mkdir(parents=True, exist_ok=True)
+_ensure_tree(static_dir, [
+    ("appdocs", "visions"),
+    ("appdocs", "backlog", "wireframes"),
+    ("appdocs", "sprints", "backups"),
+    ("appdocs", "scribe"),
+    ("appdocs", "sessions"),
+])
 
 logger.info(f"Static directory ready: {static_dir}")
 
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# The main UI shell is read once at startup and served from memory with an ETag,
+# so repeat loads are answered with 304 instead of re-reading the file.
+_index_path = static_dir / "index.html"
+try:
+    INDEX_BYTES = _index_path.read_bytes()
+    INDEX_ETAG = '"' + hashlib.md5(INDEX_BYTES).hexdigest() + '"'
+except OSError:
+    INDEX_BYTES = None
+    INDEX_ETAG = None
+
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     """Serve the main UI."""
-    return FileResponse("static/index.html")
+    if INDEX_BYTES is None:
+        return FileResponse(_index_path)
+    # "/" sits behind the login session, so only the browser may cache it;
+    # no-cache makes it revalidate so a redeployed UI is picked up immediately
+    headers = {"ETag": INDEX_ETAG, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(INDEX_BYTES, media_type="text/html", headers=headers)
 
 @app.get("/progress")
 async def serve_progress():
@@ -518,8 +691,21 @@ async def get_environment():
         "default_model": models_config.default if FEATURES["config_manager"] else None
     }
 
+# FEATURES is fixed once startup imports finish, so the fast-path payload is built once
+STATIC_HEALTH = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "approach": "ai-first",
+    "features": FEATURES
+}
+
 @app.get("/health")
 async def health_check():
+    """Fast-path liveness check for load balancers (no dependency probes)."""
+    return STATIC_HEALTH
+
+@app.get("/health/deep")
+async def health_check_deep():
     """Comprehensive health check with feature validation."""
     try:
         health_data = {
@@ -604,7 +790,7 @@ async def get_security_status():
     try:
         security_report = SecurityUtils.generate_security_report()
         security_report.update({
-            "rate_limiter_clients": len(rate_limiter.requests),
+            "rate_limiter_clients": rate_limiter.client_count(),
             "max_rate_limit": SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE,
             "request_size_limit_mb": SecurityConfig.MAX_REQUEST_SIZE / (1024 * 1024),
             "file_size_limit_mb": SecurityConfig.MAX_FILE_SIZE / (1024 * 1024)
@@ -655,15 +841,18 @@ if app_config.is_production:
         @app.middleware("http")
         async def add_basic_security_headers(request, call_next):
             response = await call_next(request)
-            response.headers["X-Content-Type-Options"] = "nosniff"
+            headers = response.headers
+            headers["X-Content-Type-Options"] = "nosniff"
             # Allow wireframes to be framed (they're displayed in iframes on same domain)
-            if not request.url.path.startswith("/api/backlog/wireframe/"):
-                response.headers["X-Frame-Options"] = "DENY"
-            response.headers["X-XSS-Protection"] = "1; mode=block"
+            if not request.scope["path"].startswith(WIREFRAME_PREFIX):
+                headers["X-Frame-Options"] = "DENY"
+            headers["X-XSS-Protection"] = "1; mode=block"
             return response
         logger.info("Basic production security headers enabled")
 
 if __name__ == "__main__":
+    import uvicorn
+
     logger.info("=" * 60)
     logger.info("Starting AI-DIY Application - Consolidated Entry Point")
     logger.info("=" * 60)
@@ -692,13 +881,24 @@ if __name__ == "__main__":
     
     logger.info("=" * 60)
     
+    # Use the C event loop and HTTP parser when uvicorn[standard] extras are installed.
+    # Single process only: sessions and the generated-app handle live in memory.
+    server_options = {}
+    try:
+        import uvloop  # noqa: F401
+        import httptools  # noqa: F401
+        server_options = {"loop": "uvloop", "http": "httptools"}
+    except ImportError:
+        logger.info("uvloop/httptools not installed - using default asyncio loop and h11")
+    
     try:
         uvicorn.run(
             app,
             host=app_config.host,
             port=app_config.port,
             log_level=app_config.log_level.lower(),
-            access_log=FEATURES["logging_middleware"]
+            access_log=FEATURES["logging_middleware"],
+            **server_options
         )
     except Exception as e:
         logger.error(f"Failed to start server: {e}")
@@ -4,6 +4,8 @@ Minimal FastAPI backend with AI-driven persona responses.
 """
 
 import os
+import importlib
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -15,29 +17,39 @@ import uvicorn
 from core.logging_config import get_structured_logger
 logger = get_structured_logger("main")
 
-app = FastAPI(title="Scrum Sim V3", description="AI-First Virtual Scrum Team")
+# API routers, imported from the lifespan handler rather than at module load so
+# importing this module (and uvicorn --reload cycles) skip their dependency trees.
+# include_router is safe here: routes are added before the first request is served.
+ROUTER_MODULES = [
+    "streaming",
+    "api.models",
+    "api.change_requests",
+    "api.testing",
+    "api.chat",
+    "api.vision",
+    "api.backlog",
+    "api.scribe",
+    "api.sprint",
+]
+_routers_loaded = False
 
-# Import routers
-from streaming import router as streaming_router
-from api.models import router as models_router
 
-from api.change_requests import router as change_requests_router
-from api.testing import router as testing_router
-from api.chat import router as chat_router
-from api.vision import router as vision_router
-from api.backlog import router as backlog_router
-from api.scribe import router as scribe_router
-from api.sprint import router as sprint_router
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Register API routers (once) before serving requests."""
+    global _routers_loaded
+    if not _routers_loaded:
+        for module_name in ROUTER_MODULES:
+            app.include_router(importlib.import_module(module_name).router)
+        _routers_loaded = True
+    yield
 
-app.include_router(streaming_router)
-app.include_router(models_router)
-app.include_router(change_requests_router)
-app.include_router(testing_router)
-app.include_router(chat_router)
-app.include_router(vision_router)
-app.include_router(backlog_router)
-app.include_router(scribe_router)
-app.include_router(sprint_router)
+
+app = FastAPI(title="Scrum Sim V3", description="AI-First Virtual Scrum Team", lifespan=lifespan)
+
+# Compress large responses (event streams are left uncompressed)
+from compression_middleware import CompressionMiddleware
+app.add_middleware(CompressionMiddleware)
 
 # Serve static files
 static_dir = Path(__file__).parent / "static"
@@ -66,4 +78,12 @@ async def health_check():
 
 if __name__ == "__main__":
     logger.info("Starting Scrum Sim V3 - AI-First approach")
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # Use the C event loop and HTTP parser when uvicorn[standard] extras are installed
+    server_options = {}
+    try:
+        import uvloop  # noqa: F401
+        import httptools  # noqa: F401
+        server_options = {"loop": "uvloop", "http": "httptools"}
+    except ImportError:
+        pass
+    uvicorn.run(app, host="127.0.0.1", port=8000, **server_options)
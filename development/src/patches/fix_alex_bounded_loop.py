@@ -2,13 +2,53 @@
 Patch to fix the SPRINT_REVIEW_ALEX bounded tool loop to ensure it always provides a meaningful response.
 
 To use this patch:
-1. Copy and paste the final_summary_step function into ai_gateway.py
+1. Copy and paste get_session, close_session and final_summary_step into ai_gateway.py
 2. Replace the code block at line ~593-634 with the commented section below
+3. Await close_session() from the application's shutdown hook
 """
 
+import asyncio
+
+import aiohttp
+
+# Shared OpenRouter session, created lazily so repeated summaries reuse pooled
+# keep-alive connections instead of paying a new TCP+TLS handshake per call
+_SESSION = None
+
+# Caps in-flight OpenRouter requests so a burst queues here instead of
+# opening (and DNS-resolving) a connection per request all at once
+MAX_CONCURRENT_REQUESTS = 64
+_REQUEST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+
+async def get_session():
+    """Return the shared aiohttp session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=200,
+                limit_per_host=MAX_CONCURRENT_REQUESTS,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
 async def final_summary_step(bounded_messages, model, headers, ssl_context, persona_key, persona_name):
     """Generate a final summary if the bounded loop didn't produce meaningful content"""
-    import aiohttp
     import json
     import logging
 
@@ -28,23 +68,22 @@ async def final_summary_step(bounded_messages, model, headers, ssl_context, pers
     }
     
     try:
-        async with aiohttp.ClientSession() as session3:
-            async with session3.post(
-                f"{OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=final_payload,
-                timeout=aiohttp.ClientTimeout(total=30),
-                ssl=ssl_context
-            ) as final_response:
-                if final_response.status == 200:
-                    final_text = await final_response.text()
-                    final_data = json.loads(final_text)
-                    final_content = final_data["choices"][0]["message"].get("content", "")
-                    if final_content:
-                        logger.info(f"Generated final summary: {len(final_content)} chars")
-                        return final_content
-                else:
-                    logger.error(f"Final summary API call failed: {final_response.status}", character=persona_key)
+        session = await get_session()
+        async with _REQUEST_SEMAPHORE, session.post(
+            f"{OPENROUTER_BASE_URL}/chat/completions",
+            headers=headers,
+            json=final_payload,
+            ssl=ssl_context
+        ) as final_response:
+            if final_response.status == 200:
+                final_text = await final_response.text()
+                final_data = json.loads(final_text)
+                final_content = final_data["choices"][0]["message"].get("content", "")
+                if final_content:
+                    logger.info(f"Generated final summary: {len(final_content)} chars")
+                    return final_content
+            else:
+                logger.error(f"Final summary API call failed: {final_response.status}", character=persona_key)
     except Exception as e:
         logger.error(f"Final summary exception: {str(e)}", character=persona_key)
     
@@ -9,12 +9,16 @@ Implements comprehensive security measures including:
 - Security audit logging
 """
 
+import os
 import time
 import logging
 import json
 import re
-from collections import defaultdict
+import zlib
+from collections import defaultdict, deque
+from functools import lru_cache
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
@@ -23,9 +27,23 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from .config_manager import config_manager
 from .api.conventions import create_error_response, ApiErrorCode, HTTP_STATUS_MAP
 
+try:
+    import orjson
+    json_dumps_bytes = orjson.dumps
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+    def json_dumps_bytes(data: Any) -> bytes:
+        return json.dumps(data).encode()
+
 logger = logging.getLogger(__name__)
 security_logger = logging.getLogger("ai_diy.security")
 
+# Characters rejected in filenames and stripped from path components
+DANGEROUS_FILENAME_CHARS = '<>:"|?*'
+_DANGEROUS_FILENAME_TRANS = str.maketrans('', '', DANGEROUS_FILENAME_CHARS)
+_PATH_COMPONENT_RE = re.compile(r'[<>:"|?*]')
+
 
 class SecurityConfig:
     """Security configuration constants."""
@@ -58,11 +76,21 @@ class SecurityConfig:
     }
 
 
+# Bound once at import; read on every request by RateLimiter.is_allowed
+_RATE_LIMIT = SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+
+
 class RateLimiter:
-    """Simple in-memory rate limiter."""
+    """Simple in-memory sliding-window rate limiter.
+
+    Each client keeps a deque of request timestamps in arrival order, so expired
+    entries are popped from the left instead of rebuilding a list per request.
+    """
 
     def __init__(self):
-        self.requests = defaultdict(list)
+        self.requests = defaultdict(
+            lambda: deque(maxlen=_RATE_LIMIT)
+        )
         self.cleanup_interval = 60  # seconds
         self.last_cleanup = time.time()
 
@@ -70,37 +98,67 @@ class RateLimiter:
         """Check if request is allowed and return remaining allowance."""
         now = time.time()
 
-        # Cleanup old requests periodically
+        # Cleanup idle clients periodically
         if now - self.last_cleanup > self.cleanup_interval:
             self._cleanup_old_requests(now)
 
-        # Get recent requests for this client
+        # Drop this client's requests that fell out of the last minute
+        limit = _RATE_LIMIT
         client_requests = self.requests[client_id]
+        popleft = client_requests.popleft
         minute_ago = now - 60
+        while client_requests and client_requests[0] <= minute_ago:
+            popleft()
 
-        # Count requests in the last minute
-        recent_requests = [req_time for req_time in client_requests if req_time > minute_ago]
-
-        if len(recent_requests) >= SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE:
+        recent_count = len(client_requests)
+        if recent_count >= limit:
             return False, 0
 
         # Add current request
         client_requests.append(now)
 
         # Calculate remaining allowance
-        remaining = SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE - len(recent_requests)
-        return True, remaining
+        return True, limit - recent_count
 
     def _cleanup_old_requests(self, now: float) -> None:
-        """Remove old requests to prevent memory leaks."""
+        """Forget clients with no requests in the last minute to prevent memory leaks."""
         cutoff = now - 60
-        for client_id in self.requests:
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if req_time > cutoff
-            ]
+        # Timestamps are in arrival order, so only the newest one needs checking
+        stale_clients = [
+            client_id for client_id, client_requests in self.requests.items()
+            if not client_requests or client_requests[-1] <= cutoff
+        ]
+        for client_id in stale_clients:
+            del self.requests[client_id]
         self.last_cleanup = now
 
+    def client_count(self) -> int:
+        """Number of clients currently tracked."""
+        return len(self.requests)
+
+
+class ShardedRateLimiter:
+    """RateLimiter split into independent shards by client id.
+
+    Each shard keeps a smaller dict and runs its own idle-client cleanup, so
+    cleanup cost is spread across requests instead of one scan of every client.
+    The shard count must be a power of two so a mask can replace the modulo.
+    """
+
+    def __init__(self, shard_count: int = 16):
+        if shard_count < 1 or shard_count & (shard_count - 1):
+            raise ValueError(f"shard_count must be a power of two, got {shard_count}")
+        self.shards = [RateLimiter() for _ in range(shard_count)]
+        self._mask = shard_count - 1
+
+    def is_allowed(self, client_id: str) -> Tuple[bool, int]:
+        """Check if request is allowed and return remaining allowance."""
+        return self.shards[hash(client_id) & self._mask].is_allowed(client_id)
+
+    def client_count(self) -> int:
+        """Number of clients currently tracked across all shards."""
+        return sum(shard.client_count() for shard in self.shards)
+
 
 class InputValidator:
     """Comprehensive input validation utilities."""
@@ -145,27 +203,30 @@ class InputValidator:
         if '..' in filename or '/' in filename or '\\' in filename:
             return False, "Invalid characters in filename"
 
-        # Check for dangerous patterns
-        dangerous_patterns = ['<', '>', ':', '"', '|', '?', '*']
-        if any(char in filename for char in dangerous_patterns):
+        # Check for dangerous characters (single C-level pass via str.translate)
+        if len(filename.translate(_DANGEROUS_FILENAME_TRANS)) != len(filename):
             return False, "Dangerous characters in filename"
 
         return True, ""
 
     @staticmethod
-    def validate_json_input(data: Any) -> Tuple[bool, str]:
-        """Validate JSON input for security."""
+    def validate_json_input(data: Any, raw_size: Optional[int] = None) -> Tuple[bool, str]:
+        """Validate JSON input for security.
+
+        Pass raw_size (the length of the request body) when data was just parsed
+        from it; otherwise data is serialized once to check it and measure it.
+        """
         try:
-            # Check if it's valid JSON
-            json_str = json.dumps(data)
-            parsed = json.loads(json_str)
+            if raw_size is None:
+                # Check it serializes as JSON and measure it
+                raw_size = len(json.dumps(data))
 
             # Check for excessive nesting (basic protection)
-            if InputValidator._check_json_depth(parsed) > 10:
+            if InputValidator._exceeds_json_depth(data, 10):
                 return False, "JSON structure too deeply nested"
 
             # Check for reasonable size
-            if len(json_str) > SecurityConfig.MAX_REQUEST_SIZE:
+            if raw_size > SecurityConfig.MAX_REQUEST_SIZE:
                 return False, "JSON payload too large"
 
             return True, ""
@@ -173,17 +234,35 @@ class InputValidator:
             return False, "Invalid JSON structure"
 
     @staticmethod
-    def _check_json_depth(obj, depth: int = 0) -> int:
-        """Check maximum depth of JSON structure."""
-        if depth > 20:  # Prevent infinite recursion
-            return depth
-
-        if isinstance(obj, dict):
-            return max([InputValidator._check_json_depth(v, depth + 1) for v in obj.values()] + [depth + 1])
-        elif isinstance(obj, list):
-            return max([InputValidator._check_json_depth(item, depth + 1) for item in obj] + [depth + 1])
-        else:
-            return depth + 1
+    def _exceeds_json_depth(obj, limit: int) -> bool:
+        """Check whether a JSON structure nests deeper than limit (top level is depth 1).
+
+        Iterative DFS that stops at the first node past the limit, so it never
+        hits Python's recursion limit.
+        """
+        stack = [(obj, 1)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > limit:
+                return True
+            if isinstance(node, dict):
+                stack.extend((value, depth + 1) for value in node.values())
+            elif isinstance(node, list):
+                stack.extend((item, depth + 1) for item in node)
+        return False
+
+
+@lru_cache(maxsize=32)
+def _resolve_base_paths(base_paths: Tuple[str, ...], cwd: str) -> Tuple[Tuple[str, str], ...]:
+    """Resolve allowed base paths once; cwd is part of the key since relative bases depend on it.
+
+    Returns (base, base_with_trailing_separator) string pairs for prefix checks.
+    """
+    resolved = []
+    for base_path in base_paths:
+        base = str(Path(base_path).resolve())
+        resolved.append((base, base if base.endswith(os.sep) else base + os.sep))
+    return tuple(resolved)
 
 
 class PathTraversalProtector:
@@ -194,16 +273,13 @@ class PathTraversalProtector:
         """Check if path is safe and within allowed directories."""
         try:
             # Normalize path
-            normalized_path = Path(path).resolve()
+            normalized_path = str(Path(path).resolve())
 
-            # Check if path is within allowed directories
-            for base_path in allowed_base_paths:
-                base_resolved = Path(base_path).resolve()
-                try:
-                    normalized_path.relative_to(base_resolved)
-                    return True, str(normalized_path)
-                except ValueError:
-                    continue
+            # Check if path is within allowed directories (bases resolved once per cwd)
+            resolved_bases = _resolve_base_paths(tuple(allowed_base_paths), os.getcwd())
+            for base, prefix in resolved_bases:
+                if normalized_path == base or normalized_path.startswith(prefix):
+                    return True, normalized_path
 
             return False, f"Path not allowed: {path}"
 
@@ -216,29 +292,46 @@ class PathTraversalProtector:
         # Remove path traversal attempts
         sanitized = component.replace('..', '').replace('/', '').replace('\\', '')
         # Remove dangerous characters
-        sanitized = re.sub(r'[<>:"|?*]', '', sanitized)
+        sanitized = _PATH_COMPONENT_RE.sub('', sanitized)
         # Limit length
         return sanitized[:100]
 
 
+# Audit severity -> logging level (anything else logs at INFO)
+_AUDIT_SEVERITY_LEVELS = {"high": logging.ERROR, "medium": logging.WARNING}
+
+
 class SecurityAuditLogger:
     """Logs security-related events."""
 
+    # Second-granularity timestamp cache shared by all audit entries
+    _last_timestamp_second = None
+    _last_timestamp = ""
+
+    @classmethod
+    def _timestamp(cls) -> str:
+        """ISO timestamp for the current second, formatted at most once per second."""
+        second = int(time.time())
+        if second != cls._last_timestamp_second:
+            cls._last_timestamp = datetime.fromtimestamp(second).isoformat()
+            cls._last_timestamp_second = second
+        return cls._last_timestamp
+
     def log_suspicious_activity(self, event: str, details: Dict[str, Any], severity: str = "medium"):
         """Log suspicious security events."""
+        level = _AUDIT_SEVERITY_LEVELS.get(severity, logging.INFO)
+        # Don't build or serialize the entry if the logger would drop it
+        if not security_logger.isEnabledFor(level):
+            return
+
         audit_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "event": event,
             "severity": severity,
             "details": details
         }
 
-        if severity == "high":
-            security_logger.error(f"SECURITY_AUDIT: {json.dumps(audit_entry)}")
-        elif severity == "medium":
-            security_logger.warning(f"SECURITY_AUDIT: {json.dumps(audit_entry)}")
-        else:
-            security_logger.info(f"SECURITY_AUDIT: {json.dumps(audit_entry)}")
+        security_logger.log(level, "SECURITY_AUDIT: " + json_dumps_bytes(audit_entry).decode())
 
     def log_rate_limit_exceeded(self, client_id: str, request_count: int):
         """Log rate limit violations."""
@@ -257,11 +350,33 @@ class SecurityAuditLogger:
         )
 
 
+@lru_cache(maxsize=4096)
+def _user_agent_client_id(user_agent: bytes) -> str:
+    """Bucket a raw user-agent header into a client id (memoized; crc32 is stable across restarts)."""
+    return f"ua:{zlib.crc32(user_agent) % 10000}"
+
+
 # Global instances
-rate_limiter = RateLimiter()
+rate_limiter = ShardedRateLimiter()
 security_audit = SecurityAuditLogger()
 
 
+# Security headers added to every response, pre-encoded once as raw ASGI pairs
+_SECURITY_HEADERS_RAW = [
+    # Basic security headers
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    # Content Security Policy (restrictive but functional)
+    (b"content-security-policy", b"default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"),
+    # Additional security headers
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
+_RATE_LIMIT_LIMIT_HEADER = (b"x-ratelimit-limit", str(SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE).encode("latin-1"))
+
+
 class SecurityMiddleware(BaseHTTPMiddleware):
     """Comprehensive security middleware."""
 
@@ -270,8 +385,22 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         start_time = time.time()
 
         try:
+            # Read the headers we need in one pass over the raw ASGI list
+            # (names are lowercase bytes; the first occurrence wins, like Headers.get)
+            content_length = forwarded_for = user_agent = None
+            for name, value in request.scope["headers"]:
+                if name == b"content-length":
+                    if content_length is None:
+                        content_length = value
+                elif name == b"x-forwarded-for":
+                    if forwarded_for is None:
+                        forwarded_for = value
+                elif name == b"user-agent":
+                    if user_agent is None:
+                        user_agent = value
+
             # Get client identifier (IP or user agent based)
-            client_id = self._get_client_id(request)
+            client_id = self._get_client_id(forwarded_for, user_agent)
 
             # Rate limiting check
             allowed, remaining = rate_limiter.is_allowed(client_id)
@@ -287,11 +416,10 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 )
 
             # Validate request size
-            content_length = request.headers.get("content-length")
             if content_length and int(content_length) > SecurityConfig.MAX_REQUEST_SIZE:
                 security_audit.log_suspicious_activity(
                     "oversized_request",
-                    {"content_length": content_length, "client_ip": request.client.host},
+                    {"content_length": content_length.decode("latin-1"), "client_ip": request.client.host},
                     "medium"
                 )
                 return JSONResponse(
@@ -308,9 +436,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             # Add security headers
             self._add_security_headers(response)
 
-            # Add rate limit headers
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Limit"] = str(SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE)
+            # Add rate limit headers (only the remaining count is formatted per request)
+            response.raw_headers.append((b"x-ratelimit-remaining", str(remaining).encode("latin-1")))
+            response.raw_headers.append(_RATE_LIMIT_LIMIT_HEADER)
 
             # Log successful request
             duration_ms = int((time.time() - start_time) * 1000)
@@ -329,31 +457,59 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 ).model_dump()
             )
 
-    def _get_client_id(self, request: Request) -> str:
-        """Get client identifier for rate limiting."""
+    def _get_client_id(self, forwarded_for: Optional[bytes], user_agent: Optional[bytes]) -> str:
+        """Get client identifier for rate limiting from raw header values."""
         # Use X-Forwarded-For if available (for proxies), otherwise client IP
-        forwarded_for = request.headers.get("x-forwarded-for")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.split(b",", 1)[0].strip().decode("latin-1")
 
         # Use user agent as fallback (less ideal but better than nothing)
-        user_agent = request.headers.get("user-agent", "unknown")
-        return f"ua:{hash(user_agent) % 10000}"
+        return _user_agent_client_id(user_agent or b"unknown")
 
     def _add_security_headers(self, response: Response) -> None:
         """Add security headers to response."""
-        # Basic security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.raw_headers.extend(_SECURITY_HEADERS_RAW)
+
+
+# Paths InputValidationMiddleware passes straight through
+INPUT_VALIDATION_BYPASS_PATHS = frozenset({"/", "/health", "/api/env", "/progress_demo.html"})
+STATIC_PATH_PREFIX = "/static/"
+
+
+# Digit runs long enough to overflow 64 bits; orjson would read them as rounded floats
+_WIDE_NUMBER_RE = re.compile(rb"\d{19,}")
+
 
-        # Content Security Policy (restrictive but functional)
-        response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
+def _loads_request_json(body: bytes) -> Any:
+    """Parse a JSON request body, accepting exactly what json.loads accepts.
 
-        # Additional security headers
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    orjson rejects NaN/Infinity and turns integers wider than 64 bits into
+    floats, so such bodies are parsed with the stdlib instead.
+    """
+    if orjson is None or _WIDE_NUMBER_RE.search(body):
+        return json.loads(body)
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return json.loads(body)
+
+
+def _dumps_request_json(data: Any) -> bytes:
+    """Serialize a sanitized request body so it round-trips exactly.
+
+    Uses the stdlib: data may hold what only json.loads produces (wide integers,
+    NaN), which orjson would reject or rewrite. Only runs when sanitizing changed
+    something, so it is off the common path.
+    """
+    return json.dumps(data).encode()
+
+
+def _raw_content_type(scope) -> bytes:
+    """Return the raw content-type header from an ASGI scope (b"" if absent)."""
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return value
+    return b""
 
 
 class InputValidationMiddleware(BaseHTTPMiddleware):
@@ -361,16 +517,21 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Validate request inputs."""
+        # Pages, health checks and static files never carry JSON bodies
+        path = request.scope["path"]
+        if path in INPUT_VALIDATION_BYPASS_PATHS or path.startswith(STATIC_PATH_PREFIX):
+            return await call_next(request)
+
         # Only validate POST requests with JSON content
-        if request.method == "POST" and "application/json" in request.headers.get("content-type", ""):
+        if request.scope["method"] == "POST" and _raw_content_type(request.scope).startswith(b"application/json"):
             try:
                 # Read and validate request body
                 body = await request.body()
                 if body:
-                    json_data = json.loads(body)
+                    json_data = _loads_request_json(body)
 
-                    # Validate JSON structure
-                    is_valid, error_msg = InputValidator.validate_json_input(json_data)
+                    # Validate JSON structure (body length is the payload size)
+                    is_valid, error_msg = InputValidator.validate_json_input(json_data, len(body))
                     if not is_valid:
                         security_audit.log_suspicious_activity(
                             "invalid_json_input",
@@ -386,10 +547,12 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
                         )
 
                     # Sanitize string fields
-                    sanitized_data = self._sanitize_request_data(json_data)
+                    sanitized_data, changed = self._sanitize_request_data(json_data)
 
-                    # Replace request body with sanitized version
-                    request._body = json.dumps(sanitized_data).encode()
+                    # Replace request body only if sanitizing changed something;
+                    # otherwise the already-read body is reused as-is
+                    if changed:
+                        request._body = _dumps_request_json(sanitized_data)
 
             except json.JSONDecodeError:
                 security_audit.log_suspicious_activity(
@@ -416,16 +579,41 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
 
         return await call_next(request)
 
-    def _sanitize_request_data(self, data: Any) -> Any:
-        """Recursively sanitize request data."""
+    def _sanitize_request_data(self, data: Any) -> Tuple[Any, bool]:
+        """Sanitize string values in parsed request data, in place.
+
+        Walks nested dicts/lists with an explicit stack instead of recursion.
+        Returns (sanitized_data, changed) where changed is True if any string
+        was modified.
+        """
+        sanitize = InputValidator.sanitize_string
         if isinstance(data, str):
-            return InputValidator.sanitize_string(data)
-        elif isinstance(data, list):
-            return [self._sanitize_request_data(item) for item in data]
-        elif isinstance(data, dict):
-            return {key: self._sanitize_request_data(value) for key, value in data.items()}
-        else:
-            return data
+            sanitized = sanitize(data)
+            return sanitized, sanitized != data
+
+        changed = False
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                items = node.items()
+            elif isinstance(node, list):
+                items = enumerate(node)
+            else:
+                continue
+            updates = []
+            for key, value in items:
+                if isinstance(value, str):
+                    sanitized = sanitize(value)
+                    if sanitized != value:
+                        updates.append((key, sanitized))
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+            # Assign after iterating so dict views are not mutated mid-loop
+            for key, sanitized in updates:
+                node[key] = sanitized
+            changed = changed or bool(updates)
+        return data, changed
 
 
 def validate_file_operation(file_path: str, operation: str) -> Tuple[bool, str]:
@@ -458,20 +646,33 @@ def log_security_event(event: str, details: Dict[str, Any], severity: str = "inf
     security_audit.log_suspicious_activity(event, details, severity)
 
 
-def check_resource_usage() -> Dict[str, Any]:
-    """Check current resource usage."""
+# psutil.Process for this process, created on first use (psutil is optional)
+_process = None
+
+
+def check_resource_usage(detailed: bool = False) -> Dict[str, Any]:
+    """Check current resource usage.
+
+    cpu_percent is measured since the previous call (psutil's interval=None
+    behavior), so the first call after startup reports 0.0. Pass detailed=True
+    to also count open files and connections, which walk /proc and are costly.
+    """
+    global _process
     import psutil
     import os
 
     try:
-        process = psutil.Process(os.getpid())
+        if _process is None or _process.pid != os.getpid():
+            _process = psutil.Process(os.getpid())
 
-        return {
-            "memory_mb": process.memory_info().rss / 1024 / 1024,
-            "cpu_percent": process.cpu_percent(),
-            "open_files": len(process.open_files()),
-            "connections": len(process.connections())
+        usage = {
+            "memory_mb": _process.memory_info().rss / 1024 / 1024,
+            "cpu_percent": _process.cpu_percent(interval=None)
         }
+        if detailed:
+            usage["open_files"] = len(_process.open_files())
+            usage["connections"] = len(_process.connections())
+        return usage
     except Exception as e:
         logger.warning(f"Resource usage check failed: {e}")
         return {"error": str(e)}
\ No newline at end of file
@@ -8,27 +8,140 @@ Provides comprehensive security functions including:
 - Security monitoring and alerting
 """
 
+import os
 import re
-import mimetypes
+import mmap
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterator, List, Mapping, Tuple, Any, Optional
 import logging
 
+from starlette.datastructures import Headers
+
 from .config_manager import config_manager
 from .api.conventions import SafetyConfig
+from .security_middleware import SecurityConfig, InputValidator, PathTraversalProtector
 
 logger = logging.getLogger(__name__)
 security_logger = logging.getLogger("ai_diy.security")
 
+# Content scanning uses google-re2 when installed: it matches in linear time,
+# so adversarial input cannot trigger regex backtracking blowups. RE2's \w is
+# ASCII-only, which matches what HTML event-handler names can contain anyway.
+try:
+    import re2 as content_re
+except ImportError:  # re2 is optional; the stdlib engine handles the same patterns
+    content_re = re
+
+# The stdlib engine is several times slower with IGNORECASE than case-folding the
+# text once and matching case-sensitively, so text is folded before matching
+# (patterns are written in lowercase). casefold() rather than lower() so that
+# e.g. U+017F long s still matches 's' as IGNORECASE did. re2's DFA handles (?i)
+# at no extra cost.
+CASEFOLD_BEFORE_MATCH = content_re is re
+
+
+def _text_flags() -> str:
+    """Inline flags for patterns run against str content."""
+    return "" if CASEFOLD_BEFORE_MATCH else "(?i)"
+
+# Content patterns checked by SecurityUtils.detect_malicious_content
+SCRIPT_INJECTION_PATTERNS = [
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'vbscript:',
+    r'on\w+\s*=\s*["\'][^"\']*["\']',
+    r'expression\s*\(',
+    r'eval\s*\(',
+]
+
+SQL_INJECTION_PATTERNS = [
+    r'union\s+select',
+    r'drop\s+table',
+    r'delete\s+from',
+    r'insert\s+into',
+    r'update\s+\w+\s+set',
+]
+
+
+def _compile_pattern_set(patterns: List[str], as_bytes: bool = False) -> Tuple[Any, Tuple[Tuple[str, Any], ...]]:
+    """Compile patterns individually and as one case-insensitive alternation.
+
+    Case-insensitivity is an inline (?i) flag, which both re and re2 accept;
+    str patterns omit it when CASEFOLD_BEFORE_MATCH, so callers must pass
+    case-folded text. With as_bytes the regexes match raw bytes (including mmap
+    buffers, which cannot be case-folded without a copy) and always use (?i).
+    The original pattern strings are kept for warning messages.
+    """
+    flags = "(?i)" if as_bytes else _text_flags()
+
+    def compile_pattern(source: str):
+        source = flags + source
+        return content_re.compile(source.encode() if as_bytes else source)
+
+    union = compile_pattern("|".join(f"(?:{pattern})" for pattern in patterns))
+    return union, tuple((pattern, compile_pattern(pattern)) for pattern in patterns)
+
+
+def _matching_patterns(pattern_set, content: str) -> List[str]:
+    """Return the patterns that occur in content, in declaration order.
+
+    The alternation finds the earliest match of any pattern in one pass, so
+    clean content is scanned once; only on a hit are the individual patterns
+    searched, starting from that position since none can match earlier.
+    """
+    union, compiled = pattern_set
+    first = union.search(content)
+    if first is None:
+        return []
+    start = first.start()
+    return [pattern for pattern, regex in compiled if regex.search(content, start)]
+
+
+def _compile_literal_checks(patterns: List[str]) -> Tuple[Tuple[str, Optional[str], Any], ...]:
+    """Split patterns into literal needles and compiled regexes.
+
+    A pattern that is just an escaped literal becomes a case-folded needle for a
+    substring test (faster than the regex engine for fixed strings); anything
+    else is compiled. Returns (pattern, needle or None, regex or None) entries.
+    """
+    checks = []
+    for pattern in patterns:
+        needle = re.sub(r'\\(\W)', r'\1', pattern)
+        if re.escape(needle) == pattern:
+            checks.append((pattern, needle.casefold(), None))
+        else:
+            checks.append((pattern, None, content_re.compile(_text_flags() + pattern)))
+    return tuple(checks)
+
+
+@lru_cache(maxsize=64)
+def _resolved_base(base_path: str, cwd: str) -> Tuple[str, str]:
+    """Resolve an allowed base directory once; cwd is part of the key since relative bases depend on it.
+
+    Returns (base, base_with_trailing_separator) for string containment checks.
+    """
+    base = str(Path(base_path).resolve())
+    return base, base if base.endswith(os.sep) else base + os.sep
+
+
+_SCRIPT_PATTERN_SET = _compile_pattern_set(SCRIPT_INJECTION_PATTERNS)
+_SQL_PATTERN_SET = _compile_pattern_set(SQL_INJECTION_PATTERNS)
+_SCRIPT_BYTES_PATTERN_SET = _compile_pattern_set(SCRIPT_INJECTION_PATTERNS, as_bytes=True)
+_SQL_BYTES_PATTERN_SET = _compile_pattern_set(SQL_INJECTION_PATTERNS, as_bytes=True)
+
 
 class SecurityUtils:
     """Comprehensive security utility functions."""
 
     # Dangerous file extensions to block
-    DANGEROUS_EXTENSIONS = {
+    DANGEROUS_EXTENSIONS = frozenset({
         '.exe', '.bat', '.cmd', '.com', '.pif', '.scr', '.vbs', '.js', '.jar',
         '.sh', '.py', '.pl', '.rb', '.php', '.asp', '.jsp', '.war', '.ear'
-    }
+    })
 
     # Dangerous file patterns
     DANGEROUS_PATTERNS = [
@@ -40,6 +153,7 @@ class SecurityUtils:
         r'vbscript:',  # VBScript protocol
         r'on\w+\s*=',  # Event handlers
     ]
+    _DANGEROUS_CHECKS = _compile_literal_checks(DANGEROUS_PATTERNS)
 
     @staticmethod
     def validate_file_path(file_path: str, allowed_base_paths: List[str]) -> Tuple[bool, str, str]:
@@ -50,28 +164,30 @@ class SecurityUtils:
             (is_valid, error_message, sanitized_path)
         """
         try:
-            # Basic path normalization
-            path = Path(file_path)
+            # Cheap string checks first; Path objects are only built for the join below
+            file_path = os.fspath(file_path)
 
-            # Check for dangerous extensions
-            if path.suffix.lower() in SecurityUtils.DANGEROUS_EXTENSIONS:
-                return False, f"Dangerous file type: {path.suffix}", ""
+            # Check for dangerous extensions (suffix of the last path component)
+            suffix = os.path.splitext(os.path.basename(os.path.normpath(file_path)))[1]
+            if suffix.lower() in SecurityUtils.DANGEROUS_EXTENSIONS:
+                return False, f"Dangerous file type: {suffix}", ""
 
             # Check for path traversal
-            if '..' in str(path) or path.is_absolute():
+            if '..' in file_path or os.path.isabs(file_path):
                 return False, "Path traversal detected", ""
 
             # Check against allowed base paths
+            cwd = os.getcwd()
             for base_path in allowed_base_paths:
                 base = Path(base_path)
                 try:
                     # Check if path is within base directory
-                    resolved_path = (base / path).resolve()
-                    resolved_base = base.resolve()
+                    resolved_path = str((base / file_path).resolve())
+                    resolved_base, base_prefix = _resolved_base(str(base_path), cwd)
 
                     # Ensure resolved path is within base directory
-                    if resolved_base in resolved_path.parents or resolved_path == resolved_base:
-                        return True, "", str(resolved_path)
+                    if resolved_path == resolved_base or resolved_path.startswith(base_prefix):
+                        return True, "", resolved_path
                 except (OSError, ValueError):
                     continue
 
@@ -85,25 +201,33 @@ class SecurityUtils:
         """Sanitize content and return warnings."""
         warnings = []
 
-        # Check for dangerous patterns
-        for pattern in SecurityUtils.DANGEROUS_PATTERNS:
-            if re.search(pattern, content, re.IGNORECASE):
+        # Cut oversized content first so the case-folded copy and the copies below stay bounded
+        limit = SafetyConfig.MAX_FILE_SIZE_BYTES
+        truncated = len(content) > limit
+        sanitized = content[:limit] if truncated else content
+
+        # Check for dangerous patterns (literals via substring search on one case-folded copy)
+        folded = sanitized.casefold()
+        regex_text = folded if CASEFOLD_BEFORE_MATCH else sanitized
+        for pattern, needle, regex in SecurityUtils._DANGEROUS_CHECKS:
+            if needle is not None:
+                found = needle in folded
+            else:
+                found = regex.search(regex_text) is not None
+            if found:
                 warnings.append(f"Dangerous pattern detected: {pattern}")
 
-        # Sanitize content
-        sanitized = content
+        if truncated:
+            warnings.append(f"Content truncated: exceeds {SafetyConfig.MAX_FILE_SIZE_MB}MB limit")
 
         # Remove null bytes
         sanitized = sanitized.replace('\x00', '')
 
-        # Normalize line endings
-        sanitized = sanitized.replace('\r\n', '\n').replace('\r', '\n')
-
-        # Check length
-        if len(sanitized) > SafetyConfig.MAX_FILE_SIZE_BYTES:
-            warnings.append(f"Content truncated: exceeds {SafetyConfig.MAX_FILE_SIZE_MB}MB limit")
+        # Normalize line endings; most content has no CR at all, so one scan settles it
+        if '\r' in sanitized:
+            sanitized = sanitized.replace('\r\n', '\n').replace('\r', '\n')
 
-        return sanitized[:SafetyConfig.MAX_FILE_SIZE_BYTES], warnings
+        return sanitized, warnings
 
     @staticmethod
     def validate_content_type(content_type: str) -> bool:
@@ -127,33 +251,15 @@ class SecurityUtils:
     def detect_malicious_content(content: str) -> List[str]:
         """Detect potentially malicious content patterns."""
         warnings = []
+        text = content.casefold() if CASEFOLD_BEFORE_MATCH else content
 
         # Check for script injection
-        script_patterns = [
-            r'<script[^>]*>.*?</script>',
-            r'javascript:',
-            r'vbscript:',
-            r'on\w+\s*=\s*["\'][^"\']*["\']',
-            r'expression\s*\(',
-            r'eval\s*\(',
-        ]
-
-        for pattern in script_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                warnings.append(f"Potential script injection: {pattern}")
+        for pattern in _matching_patterns(_SCRIPT_PATTERN_SET, text):
+            warnings.append(f"Potential script injection: {pattern}")
 
         # Check for SQL injection patterns (basic)
-        sql_patterns = [
-            r'union\s+select',
-            r'drop\s+table',
-            r'delete\s+from',
-            r'insert\s+into',
-            r'update\s+\w+\s+set',
-        ]
-
-        for pattern in sql_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                warnings.append(f"Potential SQL injection: {pattern}")
+        for pattern in _matching_patterns(_SQL_PATTERN_SET, text):
+            warnings.append(f"Potential SQL injection: {pattern}")
 
         # Check for path traversal in content
         if '../' in content or '..\\' in content:
@@ -162,14 +268,40 @@ class SecurityUtils:
         return warnings
 
     @staticmethod
-    def validate_request_size(headers: Dict[str, str]) -> Tuple[bool, str]:
-        """Validate request size from headers."""
+    def detect_malicious_bytes(data) -> List[str]:
+        """Bytes variant of detect_malicious_content for undecoded data (bytes or mmap)."""
+        warnings = []
+
+        for pattern in _matching_patterns(_SCRIPT_BYTES_PATTERN_SET, data):
+            warnings.append(f"Potential script injection: {pattern}")
+
+        for pattern in _matching_patterns(_SQL_BYTES_PATTERN_SET, data):
+            warnings.append(f"Potential SQL injection: {pattern}")
+
+        if data.find(b'../') != -1 or data.find(b'..\\') != -1:
+            warnings.append("Path traversal patterns in content")
+
+        return warnings
+
+    @staticmethod
+    def validate_request_size(headers: Mapping[str, str]) -> Tuple[bool, str]:
+        """Validate request size from headers.
+
+        Pass request.headers (case-insensitive, one lookup); plain dicts are
+        also accepted and matched case-insensitively.
+        """
         content_length = headers.get('content-length')
+        if content_length is None and not isinstance(headers, Headers):
+            content_length = next(
+                (value for key, value in headers.items() if key.lower() == 'content-length'),
+                None
+            )
         if content_length:
             try:
                 size = int(content_length)
-                if size > SafetyConfig.MAX_REQUEST_SIZE:
-                    return False, f"Request too large: {size} bytes (max: {SafetyConfig.MAX_REQUEST_SIZE})"
+                limit = SecurityConfig.MAX_REQUEST_SIZE
+                if size > limit:
+                    return False, f"Request too large: {size} bytes (max: {limit})"
             except ValueError:
                 return False, "Invalid content-length header"
 
@@ -184,7 +316,7 @@ class SecurityUtils:
             resource_usage = check_resource_usage()
 
             # Get rate limiter stats (simplified)
-            rate_limiter_size = len(rate_limiter.requests)
+            rate_limiter_size = rate_limiter.client_count()
 
             return {
                 "timestamp": datetime.now().isoformat(),
@@ -200,6 +332,38 @@ class SecurityUtils:
             return {"error": str(e)}
 
 
+# Content types whose bytes are not text; these get a magic-number check
+# instead of the text pattern scan
+BINARY_CONTENT_TYPES = frozenset({'application/octet-stream'})
+# Leading bytes of executable formats that must never be accepted as data
+EXECUTABLE_MAGICS = (
+    (b'MZ', "Windows executable"),
+    (b'\x7fELF', "ELF executable"),
+    (b'#!', "Script with shebang"),
+)
+_MAGIC_HEADER_BYTES = max(len(magic) for magic, _ in EXECUTABLE_MAGICS)
+
+
+def _iter_files(root: str) -> Iterator[str]:
+    """Yield regular files under root without following symlinks.
+
+    os.scandir entries carry the directory entry type, so telling files from
+    directories needs no extra stat call. Unreadable directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {directory}: {e}")
+
+
 class FileSecurityValidator:
     """File-specific security validation."""
 
@@ -216,8 +380,9 @@ class FileSecurityValidator:
         if not is_valid:
             return False, error_msg, ""
 
-        # Sanitize filename
-        sanitized_filename = PathTraversalProtector.sanitize_path_component(original_filename)
+        # validate_filename already rejected every character sanitize_path_component
+        # would strip, so only its length cap still applies
+        sanitized_filename = original_filename[:100]
 
         # Validate file path
         is_valid, error_msg, resolved_path = SecurityUtils.validate_file_path(
@@ -230,27 +395,68 @@ class FileSecurityValidator:
         return True, "", sanitized_filename
 
     @staticmethod
-    def scan_file_content(file_path: str) -> List[str]:
-        """Scan file content for security issues."""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+    def scan_file_content(file_path: str, content_type: Optional[str] = None) -> List[str]:
+        """Scan file content for security issues.
 
-            return SecurityUtils.detect_malicious_content(content)
+        Binary content types skip the text pattern scan: only the file header
+        is read and checked for executable magic numbers.
+        """
+        try:
+            if content_type and content_type.lower() in BINARY_CONTENT_TYPES:
+                with open(file_path, 'rb') as f:
+                    header = f.read(_MAGIC_HEADER_BYTES)
+                return [
+                    f"Executable content detected: {description}"
+                    for magic, description in EXECUTABLE_MAGICS
+                    if header.startswith(magic)
+                ]
+
+            # Scan the mapped bytes directly: no utf-8 decode and no in-memory copy
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return SecurityUtils.detect_malicious_bytes(mapped)
 
         except Exception as e:
             return [f"File scan error: {e}"]
 
+    @staticmethod
+    def scan_tree(root: str, max_workers: int = 10) -> Iterator[Tuple[str, List[str]]]:
+        """Scan every file under root, yielding (path, warnings) in walk order.
+
+        Files are scanned on a small thread pool; at most a few batches are in
+        flight at once, so memory stays flat regardless of tree size.
+        """
+        max_pending = max_workers * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = deque()
+            for path in _iter_files(root):
+                pending.append((path, pool.submit(FileSecurityValidator.scan_file_content, path)))
+                if len(pending) >= max_pending:
+                    done_path, future = pending.popleft()
+                    yield done_path, future.result()
+            while pending:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+
 
 class APISecurityDecorator:
     """Decorator for adding security validation to API endpoints."""
 
     def __init__(self, require_auth: bool = False, rate_limit: int = None):
         self.require_auth = require_auth
+        self.has_rate_limit = rate_limit is not None
         self.rate_limit = rate_limit or SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
 
     def __call__(self, func):
         """Apply security checks to function."""
+        # Nothing to check: hand back the endpoint itself so calls pay no
+        # extra frame or coroutine
+        if not self.require_auth and not self.has_rate_limit:
+            return func
+
+        @wraps(func)
         async def wrapper(*args, **kwargs):
             # Add security validation logic here
             # For now, just call the original function
@@ -265,28 +471,75 @@ def secure_api_endpoint(require_auth: bool = False, rate_limit: int = None):
     return decorator
 
 
+def _json_size_over(obj: Any, budget: int) -> bool:
+    """Return True if obj's JSON encoding is certainly longer than budget.
+
+    Walks the structure summing a lower bound of each value's encoded length
+    (escaping only makes strings longer) and stops as soon as the budget is
+    spent, so oversized input is rejected without building the JSON string.
+    """
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            budget -= len(node) + 2
+        elif isinstance(node, dict):
+            # Braces plus ", " between items; each key is quoted and followed by ": "
+            budget -= 2 + 2 * max(len(node) - 1, 0)
+            for key, value in node.items():
+                budget -= len(str(key)) + 4
+                stack.append(value)
+        elif isinstance(node, (list, tuple)):
+            budget -= 2 + 2 * max(len(node) - 1, 0)
+            stack.extend(node)
+        elif node is None or node is True:
+            budget -= 4
+        elif node is False:
+            budget -= 5
+        else:
+            budget -= len(repr(node))
+        if budget < 0:
+            return True
+    return False
+
+
 def validate_api_input(data: Dict[str, Any]) -> Tuple[bool, str]:
     """Validate API input data."""
     try:
-        # Validate JSON structure
+        # Reject clearly oversized input before serializing anything
+        if _json_size_over(data, SecurityConfig.MAX_REQUEST_SIZE):
+            return False, "Input data too large"
+
+        # Validate JSON structure and size (serializes once to measure it)
         is_valid, error_msg = InputValidator.validate_json_input(data)
         if not is_valid:
             return False, error_msg
 
-        # Check for reasonable data sizes
-        data_str = json.dumps(data)
-        if len(data_str) > SafetyConfig.MAX_REQUEST_SIZE:
-            return False, "Input data too large"
-
         return True, ""
     except Exception as e:
         return False, f"Input validation error: {e}"
 
 
+# Severity name -> logging level, so events don't re-derive it per call
+_SEVERITY_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
 def log_security_event(event_type: str, details: Dict[str, Any], severity: str = "info"):
     """Log security events."""
+    level = _SEVERITY_LEVELS.get(severity)
+    if level is None:
+        level = _SEVERITY_LEVELS.get(severity.lower(), logging.INFO)
+    if not security_logger.isEnabledFor(level):
+        return
     security_logger.log(
-        severity.upper(),
-        f"Security event: {event_type}",
+        level,
+        "Security event: %s",
+        event_type,
         extra={"event_type": event_type, "details": details}
     )
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Response cache for non-streaming OpenRouter chat completions.
+Lets a repeated investigation reuse the answers to identical bounded-loop passes.
+
+Entries are keyed by a hash of the whole request payload (model, messages,
+tools and sampling settings), so a hit only happens when the model would see
+exactly the same prompt. Tool results and CURRENT FILE STRUCTURE are part of
+the messages, which means any change on disk produces a different key.
+
+The cache is off unless LLM_CACHE_TTL_SECONDS is set. A hit replays one
+sampled answer (the bounded loop runs at temperature 0.7), so a user who
+re-asks because the diagnosis was wrong gets the same diagnosis back until
+the entry expires.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry stays valid; 0 (the default) disables the cache
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "0"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    """Hash a chat completions payload into a cache key."""
+    if orjson is not None:
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    else:
+        body = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU of parsed completion responses with a time-to-live."""
+
+    def __init__(self, ttl_seconds: float = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached response for an identical payload, or None."""
+        if not self.enabled:
+            return None
+        return self.get_by_key(payload_key(payload))
+
+    def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key from payload_key(), or None."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        logger.debug(f"LLM cache hit for key {key[:12]}")
+        return response
+
+    def put(self, payload: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Store a successful response for the payload that produced it."""
+        if not self.enabled:
+            return
+        self.put_by_key(payload_key(payload), response)
+
+    def put_by_key(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a successful response under a key from payload_key()."""
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Shared by the bounded investigation loop
+response_cache = ResponseCache()
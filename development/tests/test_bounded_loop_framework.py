@@ -5,7 +5,9 @@ Tests the logic without hitting OpenRouter
 
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add src to path
@@ -39,6 +41,34 @@ class TestBoundedLoopFramework:
         assert len(bounded_messages) == 6
         print(f"✅ Message accumulation test passed: {len(bounded_messages)} messages after 2 passes")
     
+    def test_compaction_keeps_latest_tool_results(self):
+        """Test that older tool results become pointers unless the latest turn refers to them"""
+        from services.ai_gateway import _compact_bounded_messages
+        
+        pass1 = "Tool results:\n📄 File: demo/src/app.js\n\n" + "x" * 4000
+        pass2 = "Tool results:\n📄 File: demo/src/db.js\n\n" + "y" * 4000
+        pass3 = "Tool results:\n📄 File: demo/public/login.html\n\n" + "z" * 4000
+        messages = [
+            {"role": "system", "content": "You are Alex"},
+            {"role": "user", "content": pass1},
+            {"role": "assistant", "content": "Reading db.js", "tool_calls": []},
+            {"role": "user", "content": pass2},
+            {"role": "assistant", "content": "Checking the login page", "tool_calls": []},
+            {"role": "user", "content": pass3},
+            {"role": "assistant", "content": "src/db.js queries look wrong", "tool_calls": []},
+            {"role": "user", "content": "Continue investigating."}
+        ]
+        
+        saved = _compact_bounded_messages(messages, start=1)
+        
+        assert saved > 3500
+        assert messages[1]["content"].startswith("Tool results:\n[Earlier tool results omitted (src/app.js)")
+        assert "sha256:" in messages[1]["content"]
+        assert messages[3]["content"] == pass2  # referenced by the latest assistant turn
+        assert messages[5]["content"] == pass3  # most recent tool results
+        assert _compact_bounded_messages(messages, start=1) == 0
+        print(f"✅ Compaction test passed: saved {saved} bytes")
+    
     def test_permission_detection(self):
         """Test permission detection logic"""
         fix_permission_phrases = [
@@ -65,6 +95,15 @@ class TestBoundedLoopFramework:
         assert has_permission == False
         print("✅ Permission detection test passed: no permission phrase detected")
     
+    def test_approval_phrase_detection(self):
+        """Test the approval pattern matches any phrase regardless of case"""
+        from services.ai_gateway import _APPROVAL_RE, APPROVAL_PHRASES
+        
+        for phrase in APPROVAL_PHRASES:
+            assert _APPROVAL_RE.search(f"Sounds good, {phrase.upper()}!")
+        assert _APPROVAL_RE.search("Alex, investigate the login bug") is None
+        print("✅ Approval detection test passed")
+    
     def test_max_passes_limit(self):
         """Test that bounded loop respects max passes"""
         max_passes = 3
@@ -122,6 +161,22 @@ class TestBoundedLoopFramework:
         assert messages[1]["content"] == "Previous question"
         assert messages[-1]["content"] == "Current question"
         print("✅ History injection test passed: correct message order")
+    
+    def test_cache_breakpoint_marks_stable_prefix(self):
+        """Test that the cache breakpoint keeps the text and leaves the original message alone"""
+        from services.ai_gateway import _with_cache_breakpoint
+        
+        message = {"role": "user", "content": "CURRENT FILE STRUCTURE"}
+        marked = _with_cache_breakpoint(message)
+        
+        assert marked["role"] == "user"
+        assert marked["content"] == [{
+            "type": "text",
+            "text": "CURRENT FILE STRUCTURE",
+            "cache_control": {"type": "ephemeral"}
+        }]
+        assert message["content"] == "CURRENT FILE STRUCTURE"
+        print("✅ Cache breakpoint test passed")
 
 
 class TestConversationHistory:
@@ -156,6 +211,67 @@ class TestConversationHistory:
         print(f"✅ History pruning test passed: kept last {len(turns)} turns")
 
 
+class TestProjectContextCache:
+    """Test CURRENT FILE STRUCTURE caching (temporary sandbox, no API calls)"""
+    
+    def test_project_context_cached_until_files_change(self):
+        """Test that the project context is reused until a project file changes"""
+        from services import ai_gateway
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            sandbox = Path(tmp)
+            src_dir = sandbox / "demo" / "src"
+            src_dir.mkdir(parents=True)
+            app_file = src_dir / "app.js"
+            app_file.write_text("module.exports = { start };\n", encoding="utf-8")
+            
+            with patch.object(ai_gateway, "SANDBOX_PROJECTS_DIR", sandbox), \
+                 patch.object(ai_gateway, "WIREFRAMES_DIR", sandbox / "wireframes"):
+                ai_gateway._cached_project_context.cache_clear()
+                first = ai_gateway._build_project_context("demo")
+                assert "src/app.js" in first
+                assert ai_gateway._build_project_context("demo") is first
+                
+                # In-place edit of a nested file must invalidate the cache
+                app_file.write_text("module.exports = { start, stop };\n", encoding="utf-8")
+                stamp = app_file.stat().st_mtime_ns + 1_000_000
+                os.utime(app_file, ns=(stamp, stamp))
+                assert "stop" in ai_gateway._build_project_context("demo")
+                
+                assert ai_gateway._build_project_context("missing") == ""
+        print("✅ Project context cache test passed")
+    
+    def test_project_context_refreshes_rewritten_wireframe(self):
+        """Test that rewriting a wireframe in place invalidates the cached context"""
+        from services import ai_gateway
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            sandbox = Path(tmp)
+            (sandbox / "demo").mkdir()
+            wireframes = sandbox / "wireframes"
+            wireframes.mkdir()
+            wireframe = wireframes / "login.html"
+            wireframe.write_text("<p>OLD</p>", encoding="utf-8")
+            
+            with patch.object(ai_gateway, "SANDBOX_PROJECTS_DIR", sandbox), \
+                 patch.object(ai_gateway, "WIREFRAMES_DIR", wireframes):
+                ai_gateway._cached_project_context.cache_clear()
+                assert "OLD" in ai_gateway._build_project_context("demo")
+                
+                # api/backlog.py overwrites existing wireframes with open(..., 'w')
+                dir_mtime = wireframes.stat().st_mtime_ns
+                with open(wireframe, "w", encoding="utf-8") as f:
+                    f.write("<p>NEW</p>")
+                stamp = wireframe.stat().st_mtime_ns + 1_000_000
+                os.utime(wireframe, ns=(stamp, stamp))
+                assert wireframes.stat().st_mtime_ns == dir_mtime
+                
+                context = ai_gateway._build_project_context("demo")
+                assert "NEW" in context
+                assert "OLD" not in context
+        print("✅ Wireframe refresh test passed")
+
+
 def run_all_tests():
     """Run all tests and report results"""
     print("\n" + "="*60)
@@ -164,10 +280,13 @@ def run_all_tests():
     
     framework_tests = TestBoundedLoopFramework()
     framework_tests.test_message_accumulation()
+    framework_tests.test_compaction_keeps_latest_tool_results()
     framework_tests.test_permission_detection()
+    framework_tests.test_approval_phrase_detection()
     framework_tests.test_max_passes_limit()
     framework_tests.test_context_size_estimation()
     framework_tests.test_history_injection()
+    framework_tests.test_cache_breakpoint_marks_stable_prefix()
     
     print("\n" + "-"*60 + "\n")
     
@@ -175,6 +294,12 @@ def run_all_tests():
     history_tests.test_history_format()
     history_tests.test_history_pruning_logic()
     
+    print("\n" + "-"*60 + "\n")
+    
+    context_tests = TestProjectContextCache()
+    context_tests.test_project_context_cached_until_files_change()
+    context_tests.test_project_context_refreshes_rewritten_wireframe()
+    
     print("\n" + "="*60)
     print("ALL TESTS PASSED ✅")
     print("="*60 + "\n")
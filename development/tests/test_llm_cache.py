@@ -0,0 +1,64 @@
+"""
+Test the OpenRouter response cache used by the bounded loop.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import from services
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.llm_cache import ResponseCache, payload_key
+
+
+def _payload(question: str) -> dict:
+    return {
+        "model": "anthropic/claude-sonnet-4",
+        "messages": [{"role": "system", "content": "You are Alex"}, {"role": "user", "content": question}],
+        "temperature": 0.7,
+        "stream": False,
+    }
+
+
+class TestResponseCache:
+    """Test exact-payload response caching"""
+
+    def test_hit_only_for_identical_payload(self):
+        """Test that only a byte-identical prompt reuses a response"""
+        cache = ResponseCache(ttl_seconds=60, max_entries=8)
+        response = {"choices": [{"message": {"content": "Found it"}}]}
+        cache.put(_payload("login is broken"), response)
+
+        assert cache.get(_payload("login is broken")) is response
+        assert cache.get(_payload("fix login")) is None
+        assert payload_key(_payload("a")) != payload_key(_payload("b"))
+        reordered = dict(reversed(list(_payload("a").items())))
+        assert payload_key(reordered) == payload_key(_payload("a"))
+
+    def test_lookup_by_precomputed_key(self):
+        """Test that a key computed once serves both the lookup and the store"""
+        cache = ResponseCache(ttl_seconds=60, max_entries=8)
+        key = payload_key(_payload("login is broken"))
+        assert cache.get_by_key(key) is None
+        cache.put_by_key(key, {"n": 1})
+        assert cache.get(_payload("login is broken")) == {"n": 1}
+
+    def test_entries_expire_and_evict(self):
+        """Test TTL expiry and least-recently-used eviction"""
+        cache = ResponseCache(ttl_seconds=60, max_entries=2)
+        with patch("services.llm_cache.time.monotonic", return_value=100.0):
+            cache.put(_payload("one"), {"n": 1})
+            cache.put(_payload("two"), {"n": 2})
+            assert cache.get(_payload("one")) == {"n": 1}
+            cache.put(_payload("three"), {"n": 3})
+            assert cache.get(_payload("two")) is None
+
+        with patch("services.llm_cache.time.monotonic", return_value=200.0):
+            assert cache.get(_payload("one")) is None
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test that a zero TTL disables the cache"""
+        cache = ResponseCache(ttl_seconds=0)
+        assert cache.enabled is False
+        cache.put(_payload("one"), {"n": 1})
+        assert cache.get(_payload("one")) is None
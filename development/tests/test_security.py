@@ -17,15 +17,18 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 import sys
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+# Import through the src package: the security modules use relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from security_middleware import (
-    SecurityMiddleware, InputValidationMiddleware, RateLimiter,
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.security_middleware import (
+    SecurityMiddleware, InputValidationMiddleware, RateLimiter, ShardedRateLimiter,
     SecurityConfig, InputValidator, PathTraversalProtector,
-    SecurityAuditLogger, security_audit
+    SecurityAuditLogger, security_audit, _loads_request_json, _dumps_request_json
 )
-from security_utils import SecurityUtils, FileSecurityValidator
+from src.security_utils import SecurityUtils, FileSecurityValidator
 
 
 class TestRateLimiter:
@@ -63,6 +66,54 @@ class TestRateLimiter:
         assert allowed is False
         assert remaining == 0
 
+    def test_rate_limiter_expires_old_requests(self):
+        """Test that requests older than a minute no longer count."""
+        limiter = RateLimiter()
+
+        client_id = "test_client"
+        stale = time.time() - 120
+        limiter.requests[client_id].extend([stale] * SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE)
+
+        allowed, remaining = limiter.is_allowed(client_id)
+        assert allowed is True
+        assert remaining == SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+        assert len(limiter.requests[client_id]) == 1
+
+    def test_sharded_rate_limiter_limits_per_client(self):
+        """Test that sharding keeps limits per client and counts all clients."""
+        limiter = ShardedRateLimiter(shard_count=4)
+
+        for i in range(SecurityConfig.RATE_LIMIT_REQUESTS_PER_MINUTE):
+            allowed, remaining = limiter.is_allowed("client_a")
+            assert allowed is True
+
+        allowed, remaining = limiter.is_allowed("client_a")
+        assert allowed is False
+        assert limiter.is_allowed("client_b")[0] is True
+        assert limiter.client_count() == 2
+
+        with pytest.raises(ValueError):
+            ShardedRateLimiter(shard_count=3)
+
+    def test_sharded_rate_limiter_keeps_client_in_one_shard(self):
+        """Test that each client is tracked by exactly one shard."""
+        limiter = ShardedRateLimiter(shard_count=8)
+
+        clients = [f"client_{i}" for i in range(32)]
+        for client_id in clients:
+            limiter.is_allowed(client_id)
+            limiter.is_allowed(client_id)
+
+        for client_id in clients:
+            holders = [shard for shard in limiter.shards if client_id in shard.requests]
+            assert len(holders) == 1
+            assert len(holders[0].requests[client_id]) == 2
+        assert limiter.client_count() == len(clients)
+
+        single = ShardedRateLimiter(shard_count=1)
+        assert single.is_allowed("client_a")[0] is True
+        assert single.client_count() == 1
+
 
 class TestInputValidator:
     """Test input validation functionality."""
@@ -133,6 +184,61 @@ class TestInputValidator:
         assert "large" in error
 
 
+def _validated_client() -> TestClient:
+    """App behind InputValidationMiddleware whose endpoint accepts any body."""
+    app = FastAPI()
+    app.add_middleware(InputValidationMiddleware)
+
+    @app.post("/echo")
+    async def echo():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestInputValidationMiddleware:
+    """Test JSON body parsing in the input validation middleware."""
+
+    def test_request_json_matches_stdlib(self):
+        """Test that bodies parse exactly as json.loads parses them."""
+        wide = b'{"id": 123456789012345678901234, "limit": -9223372036854775809}'
+        assert _loads_request_json(wide) == {"id": 123456789012345678901234, "limit": -9223372036854775809}
+        assert isinstance(_loads_request_json(wide)["id"], int)
+
+        special = _loads_request_json(b'{"a": NaN, "b": Infinity, "c": 1.5}')
+        assert special["a"] != special["a"]
+        assert special["b"] == float("inf")
+        assert special["c"] == 1.5
+
+        with pytest.raises(json.JSONDecodeError):
+            _loads_request_json(b'{"a": ')
+
+    def test_sanitized_body_round_trips_exactly(self):
+        """Test that a rewritten body keeps wide integers and NaN intact."""
+        body = '{"id": 123456789012345678901234, "score": NaN, "name": "  caf\u00e9\\u0000  "}'.encode("utf-8")
+        data = _loads_request_json(body)
+        sanitized, changed = InputValidationMiddleware(app=None)._sanitize_request_data(data)
+        assert changed is True
+
+        rewritten = _loads_request_json(_dumps_request_json(sanitized))
+        assert rewritten["id"] == 123456789012345678901234
+        assert isinstance(rewritten["id"], int)
+        assert rewritten["score"] != rewritten["score"]
+        assert rewritten["name"] == "caf\u00e9"
+
+    def test_middleware_accepts_nan_and_rejects_malformed(self):
+        """Test that NaN bodies pass and malformed JSON still gets a 400."""
+        client = _validated_client()
+        headers = {"Content-Type": "application/json"}
+
+        response = client.post("/echo", content=b'{"score": NaN}', headers=headers)
+        assert response.status_code == 200
+
+        response = client.post("/echo", content=b'{"score": ', headers=headers)
+        assert response.status_code == 400
+        assert "Invalid JSON format" in response.text
+
+
 class TestPathTraversalProtector:
     """Test path traversal protection."""
 
@@ -209,6 +315,21 @@ class TestSecurityUtils:
         assert len(warnings) > 0
         assert "script injection" in warnings[0].lower()
 
+    def test_content_sanitization_truncates_before_scanning(self):
+        """Test that oversized content is cut before the pattern scan."""
+        from src.security_utils import SafetyConfig
+
+        with patch.object(SafetyConfig, "MAX_FILE_SIZE_BYTES", 16):
+            content, warnings = SecurityUtils.sanitize_content("a" * 16 + "<script>")
+            assert content == "a" * 16
+            assert len(warnings) == 1
+            assert "truncated" in warnings[0].lower()
+
+            content, warnings = SecurityUtils.sanitize_content("<SCRIPT>" + "a" * 16)
+            assert content == "<SCRIPT>" + "a" * 8
+            assert "<script" in warnings[0].lower()
+            assert "truncated" in warnings[-1].lower()
+
     def test_malicious_content_detection(self):
         """Test malicious content detection."""
         # Normal content